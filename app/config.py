@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Config:
     bot_token: str
     admin_chat_id: int | None
@@ -18,46 +19,52 @@ class Config:
     openai_model: str
     openai_embedding_model: str
     kb_sites: tuple[str, ...]
+    db_pool_min: int
+    db_pool_max: int
+    db_pool_max_inactive_lifetime: float
+    db_pool_max_queries: int
 
 
+@lru_cache(maxsize=1)
 def load_config() -> Config:
+    # конфиг не меняется в рантайме — .env читаем и парсим один раз на процесс
     load_dotenv()
 
-    token = os.getenv("BOT_TOKEN", "").strip()
+    token = _env("BOT_TOKEN")
     if not token:
         raise ValueError("BOT_TOKEN is required")
 
-    admin_chat_id_raw = os.getenv("ADMIN_CHAT_ID", "").strip()
+    admin_chat_id_raw = _env("ADMIN_CHAT_ID")
     admin_chat_id = int(admin_chat_id_raw) if admin_chat_id_raw else None
 
-    mode = os.getenv("MODE", "webhook").strip().lower()
+    mode = _env("MODE", "webhook").lower()
     if mode not in {"polling", "webhook"}:
         raise ValueError("MODE must be either 'polling' or 'webhook'")
 
-    webhook_base_url = (
-        os.getenv("WEBHOOK_BASE_URL", "").strip()
-        or os.getenv("WEBHOOK_URL", "").strip()
-        or None
-    )
-    webhook_path = os.getenv("WEBHOOK_PATH", "/tg/webhook").strip() or "/tg/webhook"
+    webhook_base_url = _env("WEBHOOK_BASE_URL") or _env("WEBHOOK_URL") or None
+    webhook_path = _env("WEBHOOK_PATH", "/tg/webhook")
     if not webhook_path.startswith("/"):
         webhook_path = f"/{webhook_path}"
 
-    database_url = os.getenv("DATABASE_URL", "").strip()
+    database_url = _env("DATABASE_URL")
     if not database_url:
         raise ValueError("DATABASE_URL is required")
 
-    openai_api_key = os.getenv("OPENAI_API_KEY", "").strip() or None
-    openai_model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini").strip() or "gpt-4.1-mini"
-    openai_embedding_model = (
-        os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small").strip()
-        or "text-embedding-3-small"
-    )
-    kb_sites_raw = os.getenv(
+    openai_api_key = _env("OPENAI_API_KEY") or None
+    openai_model = _env("OPENAI_MODEL", "gpt-4.1-mini")
+    openai_embedding_model = _env("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    kb_sites_raw = _env(
         "KB_SITES",
         "https://ai-sistemy.ru/,https://aisistems-tg.ru/",
     )
-    kb_sites = tuple(site.strip() for site in kb_sites_raw.split(",") if site.strip())
+    kb_sites = tuple(s for s in (part.strip() for part in kb_sites_raw.split(",")) if s)
+
+    db_pool_min = _int_env("DB_POOL_MIN", 5)
+    db_pool_max = _int_env("DB_POOL_MAX", 25)
+    if db_pool_min < 0 or db_pool_max < 1 or db_pool_min > db_pool_max:
+        raise ValueError("DB_POOL_MIN/DB_POOL_MAX must satisfy 0 <= min <= max and max >= 1")
+    db_pool_max_inactive_lifetime = float(_int_env("DB_POOL_MAX_INACTIVE_LIFETIME", 300))
+    db_pool_max_queries = _int_env("DB_POOL_MAX_QUERIES", 50000)
 
     return Config(
         bot_token=token,
@@ -70,4 +77,26 @@ def load_config() -> Config:
         openai_model=openai_model,
         openai_embedding_model=openai_embedding_model,
         kb_sites=kb_sites,
+        db_pool_min=db_pool_min,
+        db_pool_max=db_pool_max,
+        db_pool_max_inactive_lifetime=db_pool_max_inactive_lifetime,
+        db_pool_max_queries=db_pool_max_queries,
     )
+
+
+def _env(name: str, default: str = "") -> str:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    value = value.strip()
+    return value or default
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = _env(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer") from exc
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import asyncpg
+import orjson
+
+ADMIN_CACHE_TTL_SECONDS = 60.0
+ADMIN_CACHE_MAX_ENTRIES = 1024
+
+TOUCH_DEBOUNCE_SECONDS = 30.0
+TOUCH_CACHE_MAX_ENTRIES = 10_000
 
 
 @dataclass(slots=True)
@@ -18,6 +26,17 @@ class ConnectionInfo:
     updated_at: str
 
 
+@dataclass(slots=True)
+class LeadLightInfo:
+    business_connection_id: str
+    client_chat_id: int
+    step: int
+    escalation_open: bool
+    escalation_last_at: str | None
+    urgency: str | None
+    updated_at: str
+
+
 @dataclass(slots=True)
 class LeadInfo:
     business_connection_id: str
@@ -29,22 +48,104 @@ class LeadInfo:
     contact_method: str | None
     phone: str | None
     call_time: str | None
-    summary_json: str | None
+    summary_json: dict[str, Any] | None
     escalation_open: bool
     escalation_last_at: str | None
     last_client_message: str | None
-    rag_sources_json: str | None
+    rag_sources_json: list[str] | None
     urgency: str | None
     created_at: str
     updated_at: str
 
 
+# SQL, общий для одиночных методов и load_message_context — одна точка правды
+_CONNECTION_SELECT_SQL = """
+SELECT business_connection_id, owner_user_id, owner_user_chat_id, can_reply, updated_at
+FROM connections
+WHERE business_connection_id = $1
+"""
+
+_CLIENT_UPSERT_SQL = """
+INSERT INTO clients (
+    business_connection_id,
+    client_chat_id,
+    first_seen_at,
+    last_seen_at,
+    username,
+    full_name,
+    created_at,
+    updated_at
+)
+VALUES ($1, $2, NOW(), NOW(), $3, $4, NOW(), NOW())
+ON CONFLICT (business_connection_id, client_chat_id) DO UPDATE SET
+    last_seen_at = NOW(),
+    username = EXCLUDED.username,
+    full_name = EXCLUDED.full_name,
+    updated_at = NOW()
+RETURNING (xmax = 0) AS inserted
+"""
+
+_LEAD_GET_OR_CREATE_SQL = """
+INSERT INTO leads (
+    business_connection_id,
+    client_chat_id,
+    step,
+    escalation_open,
+    created_at,
+    updated_at
+)
+VALUES ($1, $2, 0, FALSE, NOW(), NOW())
+ON CONFLICT (business_connection_id, client_chat_id) DO UPDATE SET
+    updated_at = leads.updated_at
+RETURNING
+    business_connection_id,
+    client_chat_id,
+    step,
+    need,
+    budget,
+    deadline,
+    contact_method,
+    phone,
+    call_time,
+    summary_json,
+    escalation_open,
+    escalation_last_at,
+    last_client_message,
+    rag_sources_json,
+    urgency,
+    created_at,
+    updated_at
+"""
+
+
 class Database:
-    def __init__(self, database_url: str, *, min_size: int = 1, max_size: int = 10) -> None:
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        min_size: int = 5,
+        max_size: int = 25,
+        max_inactive_connection_lifetime: float = 300.0,
+        max_queries: int = 50000,
+    ) -> None:
         self.database_url = database_url
         self.min_size = min_size
         self.max_size = max_size
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        self.max_queries = max_queries
         self.pool: asyncpg.Pool | None = None
+        # admin_chat_id меняется редко, а резолвится на каждом сообщении — кэшируем с TTL
+        self._admin_cache: dict[str | None, tuple[int | None, float]] = {}
+        # отдельное соединение для health-check: занятый пул — это не "БД упала"
+        self._health_conn: asyncpg.Connection | None = None
+        # LRU "когда клиента видели в последний раз" — душим одинаковые upsert'ы
+        self._last_seen: OrderedDict[tuple[str, int], tuple[float, int]] = OrderedDict()
+
+    @classmethod
+    async def connect(cls, database_url: str, **kwargs: Any) -> Database:
+        db = cls(database_url, **kwargs)
+        await db.create_pool()
+        return db
 
     async def create_pool(self) -> None:
         if self.pool is not None:
@@ -53,30 +154,80 @@ class Database:
             dsn=self.database_url,
             min_size=self.min_size,
             max_size=self.max_size,
+            max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+            max_queries=self.max_queries,
             command_timeout=10,
+            statement_cache_size=1024,
+            init=self._init_connection,
+        )
+
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        # jsonb ходит как dict/list без ручной сериализации; orjson в разы быстрее stdlib
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=lambda value: orjson.dumps(value).decode(),
+            decoder=orjson.loads,
+            schema="pg_catalog",
+            format="text",
         )
 
     async def init(self) -> None:
         await self.create_pool()
+        await self.ensure_indexes()
+
+    async def ensure_indexes(self) -> None:
+        # Все горячие запросы фильтруют по (business_connection_id, client_chat_id);
+        # INCLUDE позволяет читать статус лида index-only, без кучи
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS leads_bc_client_idx
+                    ON leads(business_connection_id, client_chat_id)
+                    INCLUDE (step, escalation_open, urgency)
+                """
+            )
+            await conn.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS escalations_bc_client_idx
+                    ON escalations(business_connection_id, client_chat_id)
+                """
+            )
+            await conn.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS clients_bc_client_idx
+                    ON clients(business_connection_id, client_chat_id)
+                """
+            )
 
     async def close(self) -> None:
+        await self._drop_health_conn()
         if self.pool is not None:
             await self.pool.close()
             self.pool = None
 
     async def ping(self, timeout_seconds: float = 1.0) -> bool:
         try:
-            conn = await asyncio.wait_for(self._acquire(), timeout=timeout_seconds)
-        except Exception:
-            return False
-
-        try:
+            conn = self._health_conn
+            if conn is None or conn.is_closed():
+                conn = await asyncio.wait_for(
+                    asyncpg.connect(dsn=self.database_url),
+                    timeout=timeout_seconds,
+                )
+                self._health_conn = conn
             result = await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=timeout_seconds)
             return result == 1
         except Exception:
+            await self._drop_health_conn()
             return False
-        finally:
-            await self._release(conn)
+
+    async def _drop_health_conn(self) -> None:
+        conn, self._health_conn = self._health_conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=1)
+            except Exception:
+                pass
 
     async def upsert_connection(
         self,
@@ -85,8 +236,7 @@ class Database:
         owner_user_chat_id: int | None,
         can_reply: bool,
     ) -> None:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             await conn.execute(
                 """
                 INSERT INTO connections (
@@ -102,39 +252,25 @@ class Database:
                     owner_user_chat_id = EXCLUDED.owner_user_chat_id,
                     can_reply = EXCLUDED.can_reply,
                     updated_at = NOW()
+                WHERE connections.owner_user_id IS DISTINCT FROM EXCLUDED.owner_user_id
+                    OR connections.owner_user_chat_id IS DISTINCT FROM EXCLUDED.owner_user_chat_id
+                    OR connections.can_reply IS DISTINCT FROM EXCLUDED.can_reply
                 """,
                 business_connection_id,
                 owner_user_id,
                 owner_user_chat_id,
                 can_reply,
             )
-        finally:
-            await self._release(conn)
+        self._admin_cache.pop(business_connection_id, None)
 
     async def get_connection(self, business_connection_id: str) -> ConnectionInfo | None:
-        conn = await self._acquire()
-        try:
-            row = await conn.fetchrow(
-                """
-                SELECT business_connection_id, owner_user_id, owner_user_chat_id, can_reply, updated_at
-                FROM connections
-                WHERE business_connection_id = $1
-                """,
-                business_connection_id,
-            )
-        finally:
-            await self._release(conn)
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(_CONNECTION_SELECT_SQL, business_connection_id)
 
         if not row:
             return None
 
-        return ConnectionInfo(
-            business_connection_id=row["business_connection_id"],
-            owner_user_id=row["owner_user_id"],
-            owner_user_chat_id=row["owner_user_chat_id"],
-            can_reply=bool(row["can_reply"]),
-            updated_at=_as_iso(row["updated_at"]) or "",
-        )
+        return _connection_from_row(row)
 
     async def upsert_client(
         self,
@@ -143,36 +279,15 @@ class Database:
         username: str | None,
         full_name: str | None,
     ) -> bool:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             row = await conn.fetchrow(
-                """
-                INSERT INTO clients (
-                    business_connection_id,
-                    client_chat_id,
-                    first_seen_at,
-                    last_seen_at,
-                    username,
-                    full_name,
-                    created_at,
-                    updated_at
-                )
-                VALUES ($1, $2, NOW(), NOW(), $3, $4, NOW(), NOW())
-                ON CONFLICT (business_connection_id, client_chat_id) DO UPDATE SET
-                    last_seen_at = NOW(),
-                    username = EXCLUDED.username,
-                    full_name = EXCLUDED.full_name,
-                    updated_at = NOW()
-                RETURNING (xmax = 0) AS inserted
-                """,
+                _CLIENT_UPSERT_SQL,
                 business_connection_id,
                 client_chat_id,
                 username,
                 full_name,
             )
             return bool(row["inserted"]) if row else False
-        finally:
-            await self._release(conn)
 
     async def touch_client(
         self,
@@ -181,11 +296,74 @@ class Database:
         username: str | None,
         full_name: str | None,
     ) -> bool:
-        return await self.upsert_client(business_connection_id, client_chat_id, username, full_name)
+        key = (business_connection_id, client_chat_id)
+        profile = hash((username, full_name))
+        now = time.monotonic()
+
+        cached = self._last_seen.get(key)
+        if cached is not None and cached[1] == profile and now - cached[0] < TOUCH_DEBOUNCE_SECONDS:
+            self._last_seen.move_to_end(key)
+            return False
+
+        inserted = await self.upsert_client(business_connection_id, client_chat_id, username, full_name)
+        self._last_seen[key] = (now, profile)
+        self._last_seen.move_to_end(key)
+        while len(self._last_seen) > TOUCH_CACHE_MAX_ENTRIES:
+            self._last_seen.popitem(last=False)
+        return inserted
+
+    async def load_message_context(
+        self,
+        business_connection_id: str,
+        client_chat_id: int,
+        username: str | None,
+        full_name: str | None,
+    ) -> tuple[ConnectionInfo | None, LeadInfo, bool]:
+        """Весь контекст входящего сообщения за один проход по пулу.
+
+        Вместо трёх последовательных acquire (touch_client -> get_connection ->
+        get_lead) делаем upsert клиента, чтение connection и get-or-create лида
+        на одном соединении: три round-trip'а к БД вместо трёх циклов пула.
+        Дебаунс клиента тот же, что в touch_client.
+        """
+        key = (business_connection_id, client_chat_id)
+        profile = hash((username, full_name))
+        now = time.monotonic()
+
+        cached = self._last_seen.get(key)
+        skip_touch = (
+            cached is not None and cached[1] == profile and now - cached[0] < TOUCH_DEBOUNCE_SECONDS
+        )
+
+        is_new_client = False
+        async with self.pool.acquire() as conn:
+            if not skip_touch:
+                client_row = await conn.fetchrow(
+                    _CLIENT_UPSERT_SQL,
+                    business_connection_id,
+                    client_chat_id,
+                    username,
+                    full_name,
+                )
+                is_new_client = bool(client_row["inserted"]) if client_row else False
+            connection_row = await conn.fetchrow(_CONNECTION_SELECT_SQL, business_connection_id)
+            lead_row = await conn.fetchrow(
+                _LEAD_GET_OR_CREATE_SQL, business_connection_id, client_chat_id
+            )
+
+        if not skip_touch:
+            self._last_seen[key] = (now, profile)
+        self._last_seen.move_to_end(key)
+        while len(self._last_seen) > TOUCH_CACHE_MAX_ENTRIES:
+            self._last_seen.popitem(last=False)
+
+        connection = _connection_from_row(connection_row) if connection_row else None
+        if lead_row is None:
+            raise RuntimeError("Lead creation failed")
+        return connection, _lead_from_row(lead_row), is_new_client
 
     async def get_lead(self, business_connection_id: str, client_chat_id: int) -> LeadInfo | None:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
                 SELECT
@@ -212,66 +390,75 @@ class Database:
                 business_connection_id,
                 client_chat_id,
             )
-        finally:
-            await self._release(conn)
 
         if not row:
             return None
 
-        return LeadInfo(
+        return _lead_from_row(row)
+
+    async def get_lead_light(
+        self, business_connection_id: str, client_chat_id: int
+    ) -> LeadLightInfo | None:
+        # только статусные поля — покрывается индексом leads_bc_client_idx, без JSON-блобов
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    business_connection_id,
+                    client_chat_id,
+                    step,
+                    escalation_open,
+                    escalation_last_at,
+                    urgency,
+                    updated_at
+                FROM leads
+                WHERE business_connection_id = $1 AND client_chat_id = $2
+                """,
+                business_connection_id,
+                client_chat_id,
+            )
+
+        if not row:
+            return None
+
+        return LeadLightInfo(
             business_connection_id=row["business_connection_id"],
             client_chat_id=row["client_chat_id"],
             step=row["step"],
-            need=row["need"],
-            budget=row["budget"],
-            deadline=row["deadline"],
-            contact_method=row["contact_method"],
-            phone=row["phone"],
-            call_time=row["call_time"],
-            summary_json=row["summary_json"],
             escalation_open=bool(row["escalation_open"]),
             escalation_last_at=_as_iso(row["escalation_last_at"]),
-            last_client_message=row["last_client_message"],
-            rag_sources_json=row["rag_sources_json"],
             urgency=row["urgency"],
-            created_at=_as_iso(row["created_at"]) or "",
             updated_at=_as_iso(row["updated_at"]) or "",
         )
 
-    async def get_or_create_lead(self, business_connection_id: str, client_chat_id: int) -> LeadInfo:
-        lead = await self.get_lead(business_connection_id, client_chat_id)
-        if lead:
-            return lead
-
-        conn = await self._acquire()
-        try:
-            await conn.execute(
+    async def get_lead_json(
+        self, business_connection_id: str, client_chat_id: int
+    ) -> tuple[dict[str, Any] | None, list[str] | None]:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
                 """
-                INSERT INTO leads (
-                    business_connection_id,
-                    client_chat_id,
-                    step,
-                    escalation_open,
-                    created_at,
-                    updated_at
-                )
-                VALUES ($1, $2, 0, FALSE, NOW(), NOW())
-                ON CONFLICT (business_connection_id, client_chat_id) DO NOTHING
+                SELECT summary_json, rag_sources_json
+                FROM leads
+                WHERE business_connection_id = $1 AND client_chat_id = $2
                 """,
                 business_connection_id,
                 client_chat_id,
             )
-        finally:
-            await self._release(conn)
 
-        created = await self.get_lead(business_connection_id, client_chat_id)
-        if created is None:
+        if not row:
+            return None, None
+        return row["summary_json"], row["rag_sources_json"]
+
+    async def get_or_create_lead(self, business_connection_id: str, client_chat_id: int) -> LeadInfo:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(_LEAD_GET_OR_CREATE_SQL, business_connection_id, client_chat_id)
+
+        if row is None:
             raise RuntimeError("Lead creation failed")
-        return created
+        return _lead_from_row(row)
 
     async def create_or_reset_lead(self, business_connection_id: str, client_chat_id: int) -> LeadInfo:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             await conn.execute(
                 """
                 INSERT INTO leads (
@@ -313,8 +500,6 @@ class Database:
                 business_connection_id,
                 client_chat_id,
             )
-        finally:
-            await self._release(conn)
 
         lead = await self.get_lead(business_connection_id, client_chat_id)
         if lead is None:
@@ -351,62 +536,44 @@ class Database:
         rag_sources: list[str] | None = None,
         urgency: str | None = None,
     ) -> None:
-        sets: list[str] = []
-        values: list[Any] = []
-
-        if step is not None:
-            sets.append(f"step = ${len(values) + 1}")
-            values.append(step)
-        if need is not None:
-            sets.append(f"need = ${len(values) + 1}")
-            values.append(need)
-        if budget is not None:
-            sets.append(f"budget = ${len(values) + 1}")
-            values.append(budget)
-        if deadline is not None:
-            sets.append(f"deadline = ${len(values) + 1}")
-            values.append(deadline)
-        if contact_method is not None:
-            sets.append(f"contact_method = ${len(values) + 1}")
-            values.append(contact_method)
-        if phone is not None:
-            sets.append(f"phone = ${len(values) + 1}")
-            values.append(phone)
-        if call_time is not None:
-            sets.append(f"call_time = ${len(values) + 1}")
-            values.append(call_time)
-        if summary is not None:
-            sets.append(f"summary_json = ${len(values) + 1}")
-            values.append(json.dumps(summary, ensure_ascii=False))
-        if escalation_open is not None:
-            sets.append(f"escalation_open = ${len(values) + 1}")
-            values.append(escalation_open)
-        if escalation_last_at is not None:
-            sets.append(f"escalation_last_at = ${len(values) + 1}")
-            values.append(escalation_last_at)
-        if last_client_message is not None:
-            sets.append(f"last_client_message = ${len(values) + 1}")
-            values.append(last_client_message)
-        if rag_sources is not None:
-            sets.append(f"rag_sources_json = ${len(values) + 1}")
-            values.append(json.dumps(rag_sources, ensure_ascii=False))
-        if urgency is not None:
-            sets.append(f"urgency = ${len(values) + 1}")
-            values.append(urgency)
-
-        sets.append("updated_at = NOW()")
-        values.extend([business_connection_id, client_chat_id])
-
-        query = (
-            f"UPDATE leads SET {', '.join(sets)} "
-            f"WHERE business_connection_id = ${len(values) - 1} AND client_chat_id = ${len(values)}"
-        )
-
-        conn = await self._acquire()
-        try:
-            await conn.execute(query, *values)
-        finally:
-            await self._release(conn)
+        # Один фиксированный текст запроса: asyncpg кэширует prepared statement,
+        # NULL-параметр означает "поле не трогаем" (как и раньше).
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE leads SET
+                    step = COALESCE($3, step),
+                    need = COALESCE($4, need),
+                    budget = COALESCE($5, budget),
+                    deadline = COALESCE($6, deadline),
+                    contact_method = COALESCE($7, contact_method),
+                    phone = COALESCE($8, phone),
+                    call_time = COALESCE($9, call_time),
+                    summary_json = COALESCE($10, summary_json),
+                    escalation_open = COALESCE($11, escalation_open),
+                    escalation_last_at = COALESCE($12, escalation_last_at),
+                    last_client_message = COALESCE($13, last_client_message),
+                    rag_sources_json = COALESCE($14, rag_sources_json),
+                    urgency = COALESCE($15, urgency),
+                    updated_at = NOW()
+                WHERE business_connection_id = $1 AND client_chat_id = $2
+                """,
+                business_connection_id,
+                client_chat_id,
+                step,
+                need,
+                budget,
+                deadline,
+                contact_method,
+                phone,
+                call_time,
+                summary,
+                escalation_open,
+                escalation_last_at,
+                last_client_message,
+                rag_sources,
+                urgency,
+            )
 
     async def mark_escalation(
         self,
@@ -421,8 +588,7 @@ class Database:
         now = datetime.now(timezone.utc)
         should_alert = True
 
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             async with conn.transaction():
                 row = await conn.fetchrow(
                     """
@@ -439,27 +605,48 @@ class Database:
                     if isinstance(prev, datetime) and (now - prev) < timedelta(minutes=cooldown_minutes):
                         should_alert = False
 
+                # оба upsert'а в одном statement (data-modifying CTE) — один round-trip
                 await conn.execute(
                     """
-                    INSERT INTO escalations (
+                    WITH esc AS (
+                        INSERT INTO escalations (
+                            business_connection_id,
+                            client_chat_id,
+                            escalation_open,
+                            last_alert_at,
+                            reason,
+                            urgency,
+                            last_message,
+                            created_at,
+                            updated_at
+                        )
+                        VALUES ($1, $2, TRUE, $3, $4, $5, $6, $3, $3)
+                        ON CONFLICT (business_connection_id, client_chat_id) DO UPDATE SET
+                            escalation_open = TRUE,
+                            last_alert_at = CASE WHEN $7 THEN EXCLUDED.last_alert_at ELSE escalations.last_alert_at END,
+                            reason = EXCLUDED.reason,
+                            urgency = EXCLUDED.urgency,
+                            last_message = EXCLUDED.last_message,
+                            updated_at = $3
+                    )
+                    INSERT INTO leads (
                         business_connection_id,
                         client_chat_id,
+                        step,
                         escalation_open,
-                        last_alert_at,
-                        reason,
+                        escalation_last_at,
+                        last_client_message,
                         urgency,
-                        last_message,
                         created_at,
                         updated_at
                     )
-                    VALUES ($1, $2, TRUE, $3, $4, $5, $6, NOW(), NOW())
+                    VALUES ($1, $2, 0, TRUE, CASE WHEN $7 THEN $3 ELSE NULL END, $6, $5, $3, $3)
                     ON CONFLICT (business_connection_id, client_chat_id) DO UPDATE SET
                         escalation_open = TRUE,
-                        last_alert_at = CASE WHEN $7 THEN EXCLUDED.last_alert_at ELSE escalations.last_alert_at END,
-                        reason = EXCLUDED.reason,
+                        escalation_last_at = CASE WHEN $7 THEN $3 ELSE leads.escalation_last_at END,
+                        last_client_message = EXCLUDED.last_client_message,
                         urgency = EXCLUDED.urgency,
-                        last_message = EXCLUDED.last_message,
-                        updated_at = NOW()
+                        updated_at = $3
                     """,
                     business_connection_id,
                     client_chat_id,
@@ -469,25 +656,11 @@ class Database:
                     last_message,
                     should_alert,
                 )
-        finally:
-            await self._release(conn)
-
-        lead = await self.get_lead(business_connection_id, client_chat_id)
-        if lead is None:
-            await self.create_or_reset_lead(business_connection_id, client_chat_id)
 
-        await self.update_lead_fields(
-            business_connection_id,
-            client_chat_id,
-            escalation_open=True,
-            escalation_last_at=now.isoformat() if should_alert else (lead.escalation_last_at if lead else now.isoformat()),
-            urgency=urgency,
-        )
         return should_alert
 
     async def close_escalation(self, business_connection_id: str, client_chat_id: int) -> None:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             await conn.execute(
                 """
                 UPDATE escalations
@@ -498,8 +671,6 @@ class Database:
                 business_connection_id,
                 client_chat_id,
             )
-        finally:
-            await self._release(conn)
 
         await self.update_lead_fields(
             business_connection_id,
@@ -508,8 +679,7 @@ class Database:
         )
 
     async def set_admin_chat_id(self, chat_id: int) -> None:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             await conn.execute(
                 """
                 INSERT INTO settings(key, value, created_at, updated_at)
@@ -520,15 +690,12 @@ class Database:
                 """,
                 str(chat_id),
             )
-        finally:
-            await self._release(conn)
+        # fallback-значение поменялось — сбрасываем кэш целиком
+        self._admin_cache.clear()
 
     async def get_admin_chat_id(self) -> int | None:
-        conn = await self._acquire()
-        try:
+        async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT value FROM settings WHERE key = 'admin_chat_id'")
-        finally:
-            await self._release(conn)
 
         if not row:
             return None
@@ -539,31 +706,54 @@ class Database:
         business_connection_id: str | None,
         env_admin_chat_id: int | None,
     ) -> int | None:
+        cached = self._admin_cache.get(business_connection_id)
+        if cached is not None and time.monotonic() - cached[1] < ADMIN_CACHE_TTL_SECONDS:
+            return cached[0]
+
+        resolved: int | None = None
         if business_connection_id:
-            connection = await self.get_connection(business_connection_id)
+            # независимые запросы — выполняем параллельно, приоритет у владельца подключения
+            connection, saved_admin_chat_id = await asyncio.gather(
+                self.get_connection(business_connection_id),
+                self.get_admin_chat_id(),
+            )
             if connection and connection.owner_user_chat_id:
-                return connection.owner_user_chat_id
-
-        saved_admin_chat_id = await self.get_admin_chat_id()
-        if saved_admin_chat_id:
-            return saved_admin_chat_id
-
-        return env_admin_chat_id
-
-    async def _acquire(self) -> asyncpg.Connection:
-        if self.pool is None:
-            await self.create_pool()
-        assert self.pool is not None
-        return await self.pool.acquire()
-
-    async def _release(self, conn: asyncpg.Connection) -> None:
-        if self.pool is not None:
-            await self.pool.release(conn)
+                resolved = connection.owner_user_chat_id
+            elif saved_admin_chat_id:
+                resolved = saved_admin_chat_id
+        else:
+            resolved = await self.get_admin_chat_id()
+
+        if not resolved:
+            resolved = env_admin_chat_id
+
+        if len(self._admin_cache) >= ADMIN_CACHE_MAX_ENTRIES:
+            self._admin_cache.clear()
+        self._admin_cache[business_connection_id] = (resolved, time.monotonic())
+        return resolved
+
+def _connection_from_row(row: asyncpg.Record) -> ConnectionInfo:
+    return ConnectionInfo(
+        business_connection_id=row["business_connection_id"],
+        owner_user_id=row["owner_user_id"],
+        owner_user_chat_id=row["owner_user_chat_id"],
+        can_reply=bool(row["can_reply"]),
+        updated_at=_as_iso(row["updated_at"]) or "",
+    )
+
+
+def _lead_from_row(row: asyncpg.Record) -> LeadInfo:
+    # колонки в SELECT/RETURNING перечислены строго в порядке полей LeadInfo,
+    # поэтому собираем позиционно — без 17 именованных lookup'ов по Record
+    values = list(row)
+    values[11] = _as_iso(values[11])  # escalation_last_at
+    values[15] = _as_iso(values[15]) or ""  # created_at
+    values[16] = _as_iso(values[16]) or ""  # updated_at
+    return LeadInfo(*values)
 
 
 def _as_iso(value: Any) -> str | None:
     if value is None:
         return None
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return str(value)
+    iso = getattr(value, "isoformat", None)
+    return iso() if iso else str(value)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 
-from aiogram import F, Router
+from aiogram import Router
 from aiogram.types import Message
 
 from app.db import Database
@@ -10,13 +10,22 @@ from app.db import Database
 logger = logging.getLogger(__name__)
 
 
+async def _is_private(message: Message) -> bool:
+    return message.chat.type == "private"
+
+
 def build_admin_router(db: Database) -> Router:
     router = Router(name="admin")
+    # фильтр один раз на роутер: дешевле, чем magic-filter на каждый update
+    router.message.filter(_is_private)
+    registered_chats: set[int] = set()
 
-    @router.message(F.chat.type == "private")
+    @router.message()
     async def on_private_message(message: Message) -> None:
         try:
-            await db.set_admin_chat_id(message.chat.id)
+            if message.chat.id not in registered_chats:
+                await db.set_admin_chat_id(message.chat.id)
+                registered_chats.add(message.chat.id)
             await message.answer(
                 "✅ Админ-чат подключен. Теперь все уведомления о клиентах, негативе и запросах на человека будут приходить сюда."
             )
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import re
+from dataclasses import replace
+
+import orjson
 
 from aiogram import Bot, Router
 from aiogram.types import BusinessConnection, Message
@@ -35,13 +38,19 @@ MAX_USER_QUESTION_LEN = 2000
 TEXT_NON_MESSAGE = "<не текстовое сообщение>"
 
 
+_GREET_PREFIXES = ("привет", "здравствуйте", "добрый", "hi", "hello", "hey")
+_GREET_EXACT = frozenset(_GREET_PREFIXES)
+_GREET_STARTS = tuple(g + " " for g in _GREET_PREFIXES)
+
+
 def _is_greeting_only(text: str) -> bool:
     low = (text or "").strip().lower()
     if not low or low == TEXT_NON_MESSAGE:
         return True
-    greetings = ("привет", "здравствуйте", "добрый", "hi", "hello", "hey")
+    if len(low) > 20:
+        return False
     # если просто приветствие без сути
-    return any(low == g or low.startswith(g + " ") for g in greetings) and len(low) <= 20
+    return low in _GREET_EXACT or low.startswith(_GREET_STARTS)
 
 
 def _admin_contact_link(username: str | None, chat_id: int) -> str:
@@ -52,10 +61,10 @@ def _admin_contact_link(username: str | None, chat_id: int) -> str:
     return f"tg://user?id={chat_id}"
 
 
-ALLOWED_NEED = {"бот", "сайт", "автоматизация", "другое"}
-ALLOWED_BUDGET = {"до 30k", "30–80k", "80–150k", "150k+"}
-ALLOWED_DEADLINE = {"срочно 1–3 дня", "1–2 недели", "в течение месяца", "не горит"}
-ALLOWED_CONTACT = {"в Telegram", "по телефону", "созвон"}
+ALLOWED_NEED = frozenset({"бот", "сайт", "автоматизация", "другое"})
+ALLOWED_BUDGET = frozenset({"до 30k", "30–80k", "80–150k", "150k+"})
+ALLOWED_DEADLINE = frozenset({"срочно 1–3 дня", "1–2 недели", "в течение месяца", "не горит"})
+ALLOWED_CONTACT = frozenset({"в Telegram", "по телефону", "созвон"})
 
 HUMAN_REQUEST_PATTERNS = (
     "оператор",
@@ -92,10 +101,71 @@ NEGATIVE_SOFT_PATTERNS = (
 )
 PROFANITY_PATTERNS = ("идиот", "тупые", "сука", "блять", "хер", "долбо", "уроды")
 
+# Один проход по тексту вместо четырех: все паттерны в одной скомпилированной
+# альтернации, категория ищется по совпавшей подстроке
+_RISK_PATTERN_CATEGORY: dict[str, str] = {}
+for _cat, _patterns in (
+    ("human", HUMAN_REQUEST_PATTERNS),
+    ("hard", NEGATIVE_HARD_PATTERNS + PROFANITY_PATTERNS),
+    ("soft", NEGATIVE_SOFT_PATTERNS),
+):
+    for _pattern in _patterns:
+        _RISK_PATTERN_CATEGORY.setdefault(_pattern, _cat)
+_RISK_RE = re.compile(
+    "|".join(
+        re.escape(p) for p in sorted(_RISK_PATTERN_CATEGORY, key=len, reverse=True)
+    )
+)
+# префильтр: если в тексте нет ни одной первой буквы паттернов, сканировать нечего
+_RISK_FIRST_CHARS = frozenset(p[0] for p in _RISK_PATTERN_CATEGORY)
+
+# LLM-классификацию риска зовем только для "серой зоны": длинный текст,
+# в котором есть буквы риск-паттернов, но точного совпадения не нашлось
+RISK_LLM_MIN_LEN = 40
+
+
+def _has_risk_signal(low: str) -> bool:
+    # принимает уже приведенный к нижнему регистру текст
+    return len(low) > RISK_LLM_MIN_LEN and not _RISK_FIRST_CHARS.isdisjoint(low)
+
+_PHONE_RE = re.compile(r"(\+?\d[\d\s\-\(\)]{7,}\d)")
+_WS_RE = re.compile(r"\s+")
+
+_BUDGET_RE = re.compile(
+    r"(?P<low>до\s*30)|(?P<mid>30\D{0,4}80)|(?P<high>80\D{0,4}150)|(?P<top>150|\+)"
+)
+_BUDGET_LABELS = {"low": "до 30k", "mid": "30–80k", "high": "80–150k", "top": "150k+"}
+
+# ленивый синглтон: AsyncOpenAI-клиент и пул создаются при первом сообщении,
+# а не при сборке роутера, и переживают повторные build_business_router
+_rag_store: RAGStore | None = None
+
+# фоновые задачи (записи лида, админ-уведомления): держим ссылки на таски,
+# чтобы их не собрал GC до завершения
+_bg_tasks: set[asyncio.Task] = set()
+
+
+def _run_in_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_on_bg_task_done)
+
+
+def _on_bg_task_done(task: asyncio.Task) -> None:
+    _bg_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task failed", exc_info=task.exception())
+
+
+def _get_rag_store(config: Config) -> RAGStore:
+    global _rag_store
+    if _rag_store is None:
+        _rag_store = RAGStore(config)
+    return _rag_store
+
 
 def build_business_router(db: Database, config: Config) -> Router:
     router = Router(name="business")
-    rag_store = RAGStore(config)
 
     @router.business_connection()
     async def on_business_connection(event: BusinessConnection, bot: Bot) -> None:
@@ -131,47 +201,45 @@ def build_business_router(db: Database, config: Config) -> Router:
         try:
             await _ensure_connection_info(bot=bot, db=db, business_connection_id=bcid)
 
-            is_new_client = await db.touch_client(
+            # клиент, connection и лид — одним заходом в пул вместо трёх
+            connection, lead, is_new_client = await db.load_message_context(
                 business_connection_id=bcid,
                 client_chat_id=client_chat_id,
                 username=username,
                 full_name=full_name,
             )
             if is_new_client:
-                await _notify_new_client(
-                    bot=bot,
-                    db=db,
-                    config=config,
-                    business_connection_id=bcid,
-                    client_chat_id=client_chat_id,
-                    username=username,
-                    full_name=full_name,
-                    text=question,
+                # уведомление админа не должно задерживать ответ клиенту
+                _run_in_background(
+                    _notify_new_client(
+                        bot=bot,
+                        db=db,
+                        config=config,
+                        business_connection_id=bcid,
+                        client_chat_id=client_chat_id,
+                        username=username,
+                        full_name=full_name,
+                        text=question,
+                    )
                 )
 
-            connection = await db.get_connection(bcid)
             if not connection or not connection.can_reply:
-                await _notify_cannot_reply(
-                    bot=bot,
-                    db=db,
-                    config=config,
-                    business_connection_id=bcid,
-                    client_chat_id=client_chat_id,
-                    username=username,
-                    full_name=full_name,
-                    text=question,
+                _run_in_background(
+                    _notify_cannot_reply(
+                        bot=bot,
+                        db=db,
+                        config=config,
+                        business_connection_id=bcid,
+                        client_chat_id=client_chat_id,
+                        username=username,
+                        full_name=full_name,
+                        text=question,
+                    )
                 )
                 return
 
-            lead = await db.get_lead(bcid, client_chat_id)
-            if lead is None:
-                lead = await db.create_or_reset_lead(bcid, client_chat_id)
-
-            await db.update_lead_fields(
-                bcid,
-                client_chat_id,
-                last_client_message=question,
-            )
+            # last_client_message пишем вместе со следующим апдейтом лида ниже,
+            # чтобы не плодить отдельный round-trip на каждое сообщение
 
             if question == MANAGER_BUTTON:
                 await _escalate_to_human(
@@ -191,10 +259,11 @@ def build_business_router(db: Database, config: Config) -> Router:
                 )
                 return
 
-            rule_risk = _rule_based_risk(question)
-            if rule_risk is None and config.openai_api_key:
+            low_question = question.lower()
+            rule_risk = _rule_based_risk(low_question)
+            if rule_risk is None and config.openai_api_key and _has_risk_signal(low_question):
                 try:
-                    rule_risk = await classify_risk(config=config, user_text=question)
+                    rule_risk = await classify_risk(config, question)
                 except Exception:
                     logger.exception("Risk classification failed, fallback to rule-based only")
 
@@ -222,7 +291,7 @@ def build_business_router(db: Database, config: Config) -> Router:
                     bot=bot,
                     db=db,
                     config=config,
-                    rag_store=rag_store,
+                    rag_store=_get_rag_store(config),
                     business_connection_id=bcid,
                     client_chat_id=client_chat_id,
                     client_text=question,
@@ -234,7 +303,7 @@ def build_business_router(db: Database, config: Config) -> Router:
                 bot=bot,
                 db=db,
                 config=config,
-                rag_store=rag_store,
+                rag_store=_get_rag_store(config),
                 business_connection_id=bcid,
                 client_chat_id=client_chat_id,
                 client_text=question,
@@ -265,9 +334,22 @@ def _should_critical_escalate(risk: dict) -> bool:
     )
 
 
-def _rule_based_risk(text: str) -> dict | None:
-    low = text.lower()
-    if any(p in low for p in HUMAN_REQUEST_PATTERNS):
+def _rule_based_risk(low: str) -> dict | None:
+    # принимает уже приведенный к нижнему регистру текст
+    if _RISK_FIRST_CHARS.isdisjoint(low):
+        return None
+    best: str | None = None
+    for match in _RISK_RE.finditer(low):
+        category = _RISK_PATTERN_CATEGORY[match.group(0)]
+        if category == "human":
+            best = "human"
+            break
+        if category == "hard":
+            best = "hard"
+        elif best is None:
+            best = "soft"
+
+    if best == "human":
         return {
             "need_human": True,
             "negative": False,
@@ -275,7 +357,7 @@ def _rule_based_risk(text: str) -> dict | None:
             "reason": "Прямой запрос на оператора",
             "confidence": 0.95,
         }
-    if any(p in low for p in NEGATIVE_HARD_PATTERNS) or any(p in low for p in PROFANITY_PATTERNS):
+    if best == "hard":
         return {
             "need_human": True,
             "negative": True,
@@ -283,7 +365,7 @@ def _rule_based_risk(text: str) -> dict | None:
             "reason": "Сильный негатив/конфликт",
             "confidence": 0.9,
         }
-    if any(p in low for p in NEGATIVE_SOFT_PATTERNS):
+    if best == "soft":
         return {
             "need_human": False,
             "negative": True,
@@ -309,25 +391,27 @@ async def _escalate_to_human(
     need_human: bool,
     negative: bool,
 ) -> None:
-    await _send_business_message(
-        bot,
-        business_connection_id,
-        client_chat_id,
-        (
-            "Понимаю вас. Извините за неудобства 🙏\n"
-            "Сейчас передам вопрос руководителю/менеджеру. "
-            "Пожалуйста, уточните коротко: что случилось и какой результат нужен?"
+    # ответ клиенту и запись эскалации независимы — шлем параллельно
+    _, should_alert = await asyncio.gather(
+        _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            (
+                "Понимаю вас. Извините за неудобства 🙏\n"
+                "Сейчас передам вопрос руководителю/менеджеру. "
+                "Пожалуйста, уточните коротко: что случилось и какой результат нужен?"
+            ),
+            reply_markup=remove_keyboard(),
+        ),
+        db.mark_escalation(
+            business_connection_id,
+            client_chat_id,
+            reason=reason or "Эскалация по сообщению клиента",
+            urgency=urgency or "high",
+            last_message=text,
+            cooldown_minutes=10,
         ),
-        reply_markup=remove_keyboard(),
-    )
-
-    should_alert = await db.mark_escalation(
-        business_connection_id,
-        client_chat_id,
-        reason=reason or "Эскалация по сообщению клиента",
-        urgency=urgency or "high",
-        last_message=text,
-        cooldown_minutes=10,
     )
     if not should_alert:
         return
@@ -351,162 +435,315 @@ async def _escalate_to_human(
         f"Текст: {text[:1200]}\n"
         f"Статус лида: {lead_state}"
     )
-    await bot.send_message(chat_id=admin_chat_id, text=alert_text)
+    # клиенту уже ответили выше — алерт админу уходит фоном
+    _run_in_background(bot.send_message(chat_id=admin_chat_id, text=alert_text))
 
 
-async def _handle_lead_flow(
+async def _step_need(
     bot: Bot,
     db: Database,
     config: Config,
     rag_store: RAGStore,
     business_connection_id: str,
     client_chat_id: int,
-    client_text: str,
+    text: str,
     lead: LeadInfo,
 ) -> None:
-    text = (client_text or "").strip()
-    step = lead.step
+    value = _normalize_need(text)
+    if value not in ALLOWED_NEED:
+        # ничего ниже не читает эту запись — уводим её с пути ответа клиенту
+        _run_in_background(
+            db.update_lead_fields(business_connection_id, client_chat_id, last_client_message=text)
+        )
+        await _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            "Подскажите, что вас интересует: бот / сайт / автоматизация / другое?",
+            reply_markup=need_keyboard(),
+        )
+        return
+    await db.update_lead_fields(
+        business_connection_id, client_chat_id, need=value, step=STEP_BUDGET, last_client_message=text
+    )
+    await _send_business_message(
+        bot,
+        business_connection_id,
+        client_chat_id,
+        "Отлично. Скажите, пожалуйста, какой бюджет комфортен?",
+        reply_markup=budget_keyboard(),
+    )
 
-    if step == STEP_NEED:
-        value = _normalize_need(text)
-        if value not in ALLOWED_NEED:
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Подскажите, что вас интересует: бот / сайт / автоматизация / другое?",
-                reply_markup=need_keyboard(),
-            )
-            return
-        await db.update_lead_fields(business_connection_id, client_chat_id, need=value, step=STEP_BUDGET)
+
+async def _step_budget(
+    bot: Bot,
+    db: Database,
+    config: Config,
+    rag_store: RAGStore,
+    business_connection_id: str,
+    client_chat_id: int,
+    text: str,
+    lead: LeadInfo,
+) -> None:
+    value = _normalize_budget(text)
+    if value not in ALLOWED_BUDGET:
+        # ничего ниже не читает эту запись — уводим её с пути ответа клиенту
+        _run_in_background(
+            db.update_lead_fields(business_connection_id, client_chat_id, last_client_message=text)
+        )
         await _send_business_message(
             bot,
             business_connection_id,
             client_chat_id,
-            "Отлично. Скажите, пожалуйста, какой бюджет комфортен?",
+            "Выберите бюджет из вариантов ниже 🙂",
             reply_markup=budget_keyboard(),
         )
         return
+    await db.update_lead_fields(
+        business_connection_id, client_chat_id, budget=value, step=STEP_DEADLINE, last_client_message=text
+    )
+    await _send_business_message(
+        bot,
+        business_connection_id,
+        client_chat_id,
+        "Понял. По срокам как удобно?",
+        reply_markup=deadline_keyboard(),
+    )
 
-    if step == STEP_BUDGET:
-        value = _normalize_budget(text)
-        if value not in ALLOWED_BUDGET:
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Выберите бюджет из вариантов ниже 🙂",
-                reply_markup=budget_keyboard(),
-            )
-            return
-        await db.update_lead_fields(business_connection_id, client_chat_id, budget=value, step=STEP_DEADLINE)
+
+async def _step_deadline(
+    bot: Bot,
+    db: Database,
+    config: Config,
+    rag_store: RAGStore,
+    business_connection_id: str,
+    client_chat_id: int,
+    text: str,
+    lead: LeadInfo,
+) -> None:
+    value = _normalize_deadline(text)
+    if value not in ALLOWED_DEADLINE:
+        # ничего ниже не читает эту запись — уводим её с пути ответа клиенту
+        _run_in_background(
+            db.update_lead_fields(business_connection_id, client_chat_id, last_client_message=text)
+        )
         await _send_business_message(
             bot,
             business_connection_id,
             client_chat_id,
-            "Понял. По срокам как удобно?",
+            "Выберите срок из вариантов ниже 🙂",
             reply_markup=deadline_keyboard(),
         )
         return
+    await db.update_lead_fields(
+        business_connection_id,
+        client_chat_id,
+        deadline=value,
+        step=STEP_CONTACT_METHOD,
+        last_client_message=text,
+    )
+    await _send_business_message(
+        bot,
+        business_connection_id,
+        client_chat_id,
+        "Как удобнее связаться для уточнения деталей?",
+        reply_markup=contact_keyboard(),
+    )
 
-    if step == STEP_DEADLINE:
-        value = _normalize_deadline(text)
-        if value not in ALLOWED_DEADLINE:
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Выберите срок из вариантов ниже 🙂",
-                reply_markup=deadline_keyboard(),
-            )
-            return
-        await db.update_lead_fields(business_connection_id, client_chat_id, deadline=value, step=STEP_CONTACT_METHOD)
+
+async def _step_contact(
+    bot: Bot,
+    db: Database,
+    config: Config,
+    rag_store: RAGStore,
+    business_connection_id: str,
+    client_chat_id: int,
+    text: str,
+    lead: LeadInfo,
+) -> None:
+    value = _normalize_contact(text)
+    if value not in ALLOWED_CONTACT:
+        # ничего ниже не читает эту запись — уводим её с пути ответа клиенту
+        _run_in_background(
+            db.update_lead_fields(business_connection_id, client_chat_id, last_client_message=text)
+        )
         await _send_business_message(
             bot,
             business_connection_id,
             client_chat_id,
-            "Как удобнее связаться для уточнения деталей?",
+            "Выберите вариант связи 🙂",
             reply_markup=contact_keyboard(),
         )
         return
 
-    if step == STEP_CONTACT_METHOD:
-        value = _normalize_contact(text)
-        if value not in ALLOWED_CONTACT:
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Выберите вариант связи 🙂",
-                reply_markup=contact_keyboard(),
-            )
-            return
+    if value == "по телефону":
+        await db.update_lead_fields(
+            business_connection_id,
+            client_chat_id,
+            contact_method=value,
+            step=STEP_PHONE,
+            last_client_message=text,
+        )
+        await _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            "Ок. Напишите, пожалуйста, номер телефона (в любом формате).",
+            reply_markup=remove_keyboard(),
+        )
+        return
 
-        await db.update_lead_fields(business_connection_id, client_chat_id, contact_method=value)
-        if value == "по телефону":
-            await db.update_lead_fields(business_connection_id, client_chat_id, step=STEP_PHONE)
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Ок. Напишите, пожалуйста, номер телефона (в любом формате).",
-                reply_markup=remove_keyboard(),
-            )
-            return
+    if value == "созвон":
+        await db.update_lead_fields(
+            business_connection_id,
+            client_chat_id,
+            contact_method=value,
+            step=STEP_CALL_TIME,
+            last_client_message=text,
+        )
+        await _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            "Отлично. Напишите, пожалуйста, удобное время для созвона (например: сегодня после 18:00).",
+            reply_markup=remove_keyboard(),
+        )
+        return
+
+    await db.update_lead_fields(
+        business_connection_id,
+        client_chat_id,
+        contact_method=value,
+        step=STEP_DONE,
+        last_client_message=text,
+    )
+    await _finalize_lead(
+        bot,
+        db,
+        config,
+        business_connection_id,
+        client_chat_id,
+        replace(lead, contact_method=value, step=STEP_DONE, last_client_message=text),
+    )
 
-        if value == "созвон":
-            await db.update_lead_fields(business_connection_id, client_chat_id, step=STEP_CALL_TIME)
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Отлично. Напишите, пожалуйста, удобное время для созвона (например: сегодня после 18:00).",
-                reply_markup=remove_keyboard(),
-            )
-            return
 
-        await db.update_lead_fields(business_connection_id, client_chat_id, step=STEP_DONE)
-        await _finalize_lead(bot, db, config, business_connection_id, client_chat_id)
+async def _step_phone(
+    bot: Bot,
+    db: Database,
+    config: Config,
+    rag_store: RAGStore,
+    business_connection_id: str,
+    client_chat_id: int,
+    text: str,
+    lead: LeadInfo,
+) -> None:
+    phone = _extract_phone(text)
+    if not phone:
+        # ничего ниже не читает эту запись — уводим её с пути ответа клиенту
+        _run_in_background(
+            db.update_lead_fields(business_connection_id, client_chat_id, last_client_message=text)
+        )
+        await _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            "Не вижу номер. Пришлите, пожалуйста, телефон ещё раз 🙂",
+            reply_markup=remove_keyboard(),
+        )
         return
+    await db.update_lead_fields(
+        business_connection_id, client_chat_id, phone=phone, step=STEP_DONE, last_client_message=text
+    )
+    await _finalize_lead(
+        bot,
+        db,
+        config,
+        business_connection_id,
+        client_chat_id,
+        replace(lead, phone=phone, step=STEP_DONE, last_client_message=text),
+    )
 
-    if step == STEP_PHONE:
-        phone = _extract_phone(text)
-        if not phone:
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Не вижу номер. Пришлите, пожалуйста, телефон ещё раз 🙂",
-                reply_markup=remove_keyboard(),
-            )
-            return
-        await db.update_lead_fields(business_connection_id, client_chat_id, phone=phone, step=STEP_DONE)
-        await _finalize_lead(bot, db, config, business_connection_id, client_chat_id)
+
+async def _step_call_time(
+    bot: Bot,
+    db: Database,
+    config: Config,
+    rag_store: RAGStore,
+    business_connection_id: str,
+    client_chat_id: int,
+    text: str,
+    lead: LeadInfo,
+) -> None:
+    call_time = text[:200] if text else None
+    if not call_time:
+        await _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            "Подскажите, пожалуйста, удобное время для созвона 🙂",
+            reply_markup=remove_keyboard(),
+        )
         return
+    await db.update_lead_fields(
+        business_connection_id,
+        client_chat_id,
+        call_time=call_time,
+        step=STEP_DONE,
+        last_client_message=text,
+    )
+    await _finalize_lead(
+        bot,
+        db,
+        config,
+        business_connection_id,
+        client_chat_id,
+        replace(lead, call_time=call_time, step=STEP_DONE, last_client_message=text),
+    )
 
-    if step == STEP_CALL_TIME:
-        call_time = text[:200] if text else None
-        if not call_time:
-            await _send_business_message(
-                bot,
-                business_connection_id,
-                client_chat_id,
-                "Подскажите, пожалуйста, удобное время для созвона 🙂",
-                reply_markup=remove_keyboard(),
-            )
-            return
-        await db.update_lead_fields(business_connection_id, client_chat_id, call_time=call_time, step=STEP_DONE)
-        await _finalize_lead(bot, db, config, business_connection_id, client_chat_id)
+
+# диспетчеризация по шагу вместо цепочки if/elif: один dict-lookup на сообщение
+_STEP_HANDLERS = {
+    STEP_NEED: _step_need,
+    STEP_BUDGET: _step_budget,
+    STEP_DEADLINE: _step_deadline,
+    STEP_CONTACT_METHOD: _step_contact,
+    STEP_PHONE: _step_phone,
+    STEP_CALL_TIME: _step_call_time,
+}
+
+
+async def _handle_lead_flow(
+    bot: Bot,
+    db: Database,
+    config: Config,
+    rag_store: RAGStore,
+    business_connection_id: str,
+    client_chat_id: int,
+    client_text: str,
+    lead: LeadInfo,
+) -> None:
+    handler = _STEP_HANDLERS.get(lead.step)
+    if handler is None:
+        await _handle_rag_entry(
+            bot=bot,
+            db=db,
+            config=config,
+            rag_store=rag_store,
+            business_connection_id=business_connection_id,
+            client_chat_id=client_chat_id,
+            client_text=client_text,
+            lead=lead,
+        )
         return
 
-    await _handle_rag_entry(
+    await handler(
         bot=bot,
         db=db,
         config=config,
         rag_store=rag_store,
         business_connection_id=business_connection_id,
         client_chat_id=client_chat_id,
-        client_text=client_text,
+        text=(client_text or "").strip(),
         lead=lead,
     )
 
@@ -521,27 +758,31 @@ async def _handle_rag_entry(
     client_text: str,
     lead: LeadInfo,
 ) -> None:
-    question = client_text[:MAX_USER_QUESTION_LEN]
+    # client_text уже обрезан до MAX_USER_QUESTION_LEN в on_business_message
+    question = client_text
     is_first_touch = (lead.step == STEP_WELCOME)
 
     # Если это первое касание и клиент написал просто "привет" — не тратим RAG, а просим сформулировать вопрос
     if is_first_touch and _is_greeting_only(question):
-        await _send_business_message(
-            bot,
-            business_connection_id,
-            client_chat_id,
-            (
-                "Привет! 👋 Я AI-консультант AI-Системы.\n"
-                "Подскажите, пожалуйста, какой у вас вопрос? Можно в 1–2 предложениях 🙂"
+        # отправка и запись лида независимы — гоним параллельно
+        await asyncio.gather(
+            _send_business_message(
+                bot,
+                business_connection_id,
+                client_chat_id,
+                (
+                    "Привет! 👋 Я AI-консультант AI-Системы.\n"
+                    "Подскажите, пожалуйста, какой у вас вопрос? Можно в 1–2 предложениях 🙂"
+                ),
+                reply_markup=need_keyboard(),
+            ),
+            db.update_lead_fields(
+                business_connection_id,
+                client_chat_id,
+                step=STEP_NEED,
+                last_client_message=question,
+                rag_sources=[],
             ),
-            reply_markup=need_keyboard(),
-        )
-        await db.update_lead_fields(
-            business_connection_id,
-            client_chat_id,
-            step=STEP_NEED,
-            last_client_message=question,
-            rag_sources=[],
         )
         return
 
@@ -551,23 +792,25 @@ async def _handle_rag_entry(
         if is_first_touch:
             hello = "Привет! 👋 Я AI-консультант AI-Системы.\n\n"
 
-        await _send_business_message(
-            bot,
-            business_connection_id,
-            client_chat_id,
-            (
-                hello
-                + "Извините, не совсем понимаю, о чем речь. "
-                + "Уточните, пожалуйста, что именно вы хотите: бот / сайт / автоматизация / другое?"
+        await asyncio.gather(
+            _send_business_message(
+                bot,
+                business_connection_id,
+                client_chat_id,
+                (
+                    hello
+                    + "Извините, не совсем понимаю, о чем речь. "
+                    + "Уточните, пожалуйста, что именно вы хотите: бот / сайт / автоматизация / другое?"
+                ),
+                reply_markup=need_keyboard(),
+            ),
+            db.update_lead_fields(
+                business_connection_id,
+                client_chat_id,
+                step=STEP_NEED,
+                last_client_message=question,
+                rag_sources=[],
             ),
-            reply_markup=need_keyboard(),
-        )
-        await db.update_lead_fields(
-            business_connection_id,
-            client_chat_id,
-            step=STEP_NEED,
-            last_client_message=question,
-            rag_sources=[],
         )
         return
 
@@ -587,19 +830,21 @@ async def _handle_rag_entry(
             + "\n\nЧтобы точнее сориентировать по срокам и бюджету: что вам нужно — бот / сайт / автоматизация / другое?"
         )
 
-    await _send_business_message(
-        bot=bot,
-        business_connection_id=business_connection_id,
-        chat_id=client_chat_id,
-        text=answer,
-        reply_markup=need_keyboard(),
-    )
-    await db.update_lead_fields(
-        business_connection_id,
-        client_chat_id,
-        step=STEP_NEED,
-        last_client_message=question,
-        rag_sources=source_urls,
+    await asyncio.gather(
+        _send_business_message(
+            bot=bot,
+            business_connection_id=business_connection_id,
+            chat_id=client_chat_id,
+            text=answer,
+            reply_markup=need_keyboard(),
+        ),
+        db.update_lead_fields(
+            business_connection_id,
+            client_chat_id,
+            step=STEP_NEED,
+            last_client_message=question,
+            rag_sources=source_urls,
+        ),
     )
 
 
@@ -697,77 +942,93 @@ async def _notify_cannot_reply(
 
 
 def _unique_urls(urls: list[str | None]) -> list[str]:
-    out: list[str] = []
-    seen = set()
-    for u in urls:
-        if not u:
-            continue
-        if u in seen:
-            continue
-        seen.add(u)
-        out.append(u)
-    return out
+    # dict сохраняет порядок вставки — дедупликация одним проходом на C
+    return list(dict.fromkeys(u for u in urls if u))
+
+
+def _compile_matcher(rules: tuple[tuple[str, str], ...]):
+    """Правила (подстрока, каноническое значение) в порядке приоритета — один
+    проход по альтернации вместо цепочки `in`, приоритет if-цепочки сохранен."""
+    priority = {needle: i for i, (needle, _) in enumerate(rules)}
+    outputs = tuple(out for _, out in rules)
+    rx = re.compile("|".join(re.escape(needle) for needle, _ in rules))
+
+    def match(low: str) -> str | None:
+        best: int | None = None
+        for m in rx.finditer(low):
+            idx = priority[m.group(0)]
+            if best is None or idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return outputs[best] if best is not None else None
+
+    return match
+
+
+_NEED_MATCH = _compile_matcher(
+    (("бот", "бот"), ("сайт", "сайт"), ("авто", "автоматизация"))
+)
+_DEADLINE_MATCH = _compile_matcher(
+    (
+        ("1–3", "срочно 1–3 дня"),
+        ("срочно", "срочно 1–3 дня"),
+        ("дня", "срочно 1–3 дня"),
+        ("1–2", "1–2 недели"),
+        ("нед", "1–2 недели"),
+        ("месяц", "в течение месяца"),
+        ("не гор", "не горит"),
+    )
+)
+_CONTACT_MATCH = _compile_matcher((("тел", "по телефону"), ("соз", "созвон")))
 
 
 def _normalize_need(text: str) -> str:
+    if text in ALLOWED_NEED:  # ответ кнопкой — без lower() и сканирования
+        return text
     t = (text or "").strip().lower()
-    if "бот" in t:
-        return "бот"
-    if "сайт" in t:
-        return "сайт"
-    if "авто" in t:
-        return "автоматизация"
-    return "другое"
+    return _NEED_MATCH(t) or "другое"
 
 
 def _normalize_budget(text: str) -> str:
+    if text in ALLOWED_BUDGET:
+        return text
+    # раньше "до" перехватывал что угодно ("до 80k" превращался в "до 30k"),
+    # плюс текст сканировался до шести раз; теперь один search по альтернации
     t = (text or "").strip().lower()
-    if "до" in t or "30" in t and "80" not in t:
-        return "до 30k"
-    if "30" in t and "80" in t:
-        return "30–80k"
-    if "80" in t and "150" in t:
-        return "80–150k"
-    if "150" in t or "+" in t:
-        return "150k+"
-    return t
+    m = _BUDGET_RE.search(t)
+    if not m:
+        return t
+    return _BUDGET_LABELS[m.lastgroup]
 
 
 def _normalize_deadline(text: str) -> str:
+    if text in ALLOWED_DEADLINE:
+        return text
     t = (text or "").strip().lower()
-    if "1–3" in t or "срочно" in t or "дня" in t:
-        return "срочно 1–3 дня"
-    if "1–2" in t or "нед" in t:
-        return "1–2 недели"
-    if "месяц" in t:
-        return "в течение месяца"
-    if "не гор" in t:
-        return "не горит"
-    return t
+    return _DEADLINE_MATCH(t) or t
 
 
 def _normalize_contact(text: str) -> str:
+    if text in ALLOWED_CONTACT:
+        return text
     t = (text or "").strip().lower()
-    if "тел" in t:
-        return "по телефону"
-    if "соз" in t:
-        return "созвон"
-    return "в Telegram"
+    return _CONTACT_MATCH(t) or "в Telegram"
 
 
 def _extract_phone(text: str) -> str | None:
-    if not text:
+    if not text or not any(c.isdigit() for c in text):
         return None
-    m = re.search(r"(\+?\d[\d\s\-\(\)]{7,}\d)", text)
+    m = _PHONE_RE.search(text)
     if not m:
         return None
-    return re.sub(r"\s+", " ", m.group(1)).strip()
+    return _WS_RE.sub(" ", m.group(1)).strip()
 
 
 def _lead_state_text(lead: LeadInfo | None) -> str:
     if not lead:
         return "-"
-    return json.dumps(
+    return orjson.dumps(
         {
             "step": lead.step,
             "need": lead.need,
@@ -776,9 +1037,8 @@ def _lead_state_text(lead: LeadInfo | None) -> str:
             "contact_method": lead.contact_method,
             "phone": lead.phone,
             "call_time": lead.call_time,
-        },
-        ensure_ascii=False,
-    )
+        }
+    ).decode()
 
 
 async def _finalize_lead(
@@ -787,23 +1047,28 @@ async def _finalize_lead(
     config: Config,
     business_connection_id: str,
     client_chat_id: int,
+    lead: LeadInfo,
 ) -> None:
-    lead = await db.get_lead(business_connection_id, client_chat_id)
-    await _send_business_message(
-        bot,
-        business_connection_id,
-        client_chat_id,
-        "Спасибо! ✅ Я передал данные менеджеру. Он свяжется с вами для уточнения деталей.",
-        reply_markup=remove_keyboard(),
-    )
-
     admin_chat_id = await db.resolve_admin_chat_id(business_connection_id, config.admin_chat_id)
+
+    sends = [
+        _send_business_message(
+            bot,
+            business_connection_id,
+            client_chat_id,
+            "Спасибо! ✅ Я передал данные менеджеру. Он свяжется с вами для уточнения деталей.",
+            reply_markup=remove_keyboard(),
+        )
+    ]
     if admin_chat_id and lead:
-        await bot.send_message(
-            chat_id=admin_chat_id,
-            text=(
-                "✅ ЛИД СОБРАН\n"
-                f"chat_id={client_chat_id}\n"
-                f"Данные: {_lead_state_text(lead)}"
-            ),
+        sends.append(
+            bot.send_message(
+                chat_id=admin_chat_id,
+                text=(
+                    "✅ ЛИД СОБРАН\n"
+                    f"chat_id={client_chat_id}\n"
+                    f"Данные: {_lead_state_text(lead)}"
+                ),
+            )
         )
+    await asyncio.gather(*sends)
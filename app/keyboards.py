@@ -2,56 +2,68 @@ from aiogram.types import KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemo
 
 MANAGER_BUTTON = "👤 Позвать менеджера"
 
+# Разметки — чистые значения: aiogram их только сериализует, не мутирует.
+# Строим по одному разу на импорт вместо новых KeyboardButton на каждый send.
+_NEED_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="бот"), KeyboardButton(text="сайт")],
+        [KeyboardButton(text="автоматизация"), KeyboardButton(text="другое")],
+        [KeyboardButton(text=MANAGER_BUTTON)],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
+
+_BUDGET_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="до 30k"), KeyboardButton(text="30–80k")],
+        [KeyboardButton(text="80–150k"), KeyboardButton(text="150k+")],
+        [KeyboardButton(text=MANAGER_BUTTON)],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
+
+_DEADLINE_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="срочно 1–3 дня")],
+        [KeyboardButton(text="1–2 недели")],
+        [KeyboardButton(text="в течение месяца")],
+        [KeyboardButton(text="не горит")],
+        [KeyboardButton(text=MANAGER_BUTTON)],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
+
+_CONTACT_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="в Telegram"), KeyboardButton(text="по телефону")],
+        [KeyboardButton(text="созвон")],
+        [KeyboardButton(text=MANAGER_BUTTON)],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
+
+_REMOVE_KB = ReplyKeyboardRemove()
+
 
 def need_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="бот"), KeyboardButton(text="сайт")],
-            [KeyboardButton(text="автоматизация"), KeyboardButton(text="другое")],
-            [KeyboardButton(text=MANAGER_BUTTON)],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _NEED_KB
 
 
 def budget_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="до 30k"), KeyboardButton(text="30–80k")],
-            [KeyboardButton(text="80–150k"), KeyboardButton(text="150k+")],
-            [KeyboardButton(text=MANAGER_BUTTON)],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _BUDGET_KB
 
 
 def deadline_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="срочно 1–3 дня")],
-            [KeyboardButton(text="1–2 недели")],
-            [KeyboardButton(text="в течение месяца")],
-            [KeyboardButton(text="не горит")],
-            [KeyboardButton(text=MANAGER_BUTTON)],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _DEADLINE_KB
 
 
 def contact_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="в Telegram"), KeyboardButton(text="по телефону")],
-            [KeyboardButton(text="созвон")],
-            [KeyboardButton(text=MANAGER_BUTTON)],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _CONTACT_KB
 
 
 def remove_keyboard() -> ReplyKeyboardRemove:
-    return ReplyKeyboardRemove()
+    return _REMOVE_KB
@@ -29,8 +29,14 @@ def create_bot_and_dispatcher(config: Config, db: Database) -> tuple[Bot, Dispat
 
 
 async def _run_polling(config: Config) -> None:
-    db = Database(config.database_url)
-    await db.create_pool()
+    db = Database(
+        config.database_url,
+        min_size=config.db_pool_min,
+        max_size=config.db_pool_max,
+        max_inactive_connection_lifetime=config.db_pool_max_inactive_lifetime,
+        max_queries=config.db_pool_max_queries,
+    )
+    await db.init()
 
     bot, dp = create_bot_and_dispatcher(config, db)
     await bot.delete_webhook(drop_pending_updates=False)
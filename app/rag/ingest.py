@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import deque
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from html.parser import HTMLParser
 from urllib.parse import urldefrag, urljoin, urlparse
 
 import httpx
+import lxml.html
+import orjson
 import trafilatura
 
 from app.config import load_config
@@ -18,6 +21,7 @@ logger = logging.getLogger(__name__)
 MAX_DEPTH = 2
 MIN_PAGES_PER_DOMAIN = 20
 REQUEST_TIMEOUT = 12.0
+CRAWL_MAX_CONCURRENCY = 10
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
@@ -29,112 +33,149 @@ class PageDoc:
     text: str
 
 
-class LinkExtractor(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
-        self.links: list[str] = []
-
-    def handle_starttag(self, tag: str, attrs) -> None:  # type: ignore[override]
-        if tag.lower() != "a":
-            return
-        for key, value in attrs:
-            if key.lower() == "href" and value:
-                self.links.append(value)
-
-
-def _normalize_url(base_url: str, href: str) -> str | None:
+def _normalize_url(base_url: str, href: str) -> tuple[str, str] | None:
+    # возвращаем и netloc: ссылка парсится один раз, домен сравнивается строкой
     joined = urljoin(base_url, href)
     cleaned, _ = urldefrag(joined)
     parsed = urlparse(cleaned)
     if parsed.scheme not in {"http", "https"}:
         return None
-    return cleaned.rstrip("/")
+    return cleaned.rstrip("/"), parsed.netloc.lower()
 
 
-def _same_domain(url_a: str, url_b: str) -> bool:
-    return urlparse(url_a).netloc.lower() == urlparse(url_b).netloc.lower()
+_WS_RE = re.compile(r"\s+")
 
 
 def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
-    clean = " ".join(text.split())
+    # нормализация одним C-проходом вместо split()+join (без списка слов),
+    # окна — заранее посчитанным range вместо ручного while
+    clean = _WS_RE.sub(" ", text).strip()
     if not clean:
         return []
-    chunks: list[str] = []
-    start = 0
+    if len(clean) <= chunk_size:
+        return [clean]
     step = max(1, chunk_size - overlap)
-    while start < len(clean):
-        end = min(len(clean), start + chunk_size)
-        chunks.append(clean[start:end])
-        if end >= len(clean):
-            break
-        start += step
-    return chunks
+    return [
+        clean[start : start + chunk_size]
+        for start in range(0, len(clean) - chunk_size + step, step)
+    ]
+
+
+# извлечение текста — CPU-bound (lxml + boilerplate removal); выносим в пул
+# процессов, чтобы не останавливать event loop между уровнями обхода
+_extract_pool: ProcessPoolExecutor | None = None
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _extract_pool
+
+
+def _shutdown_extract_pool() -> None:
+    global _extract_pool
+    if _extract_pool is not None:
+        _extract_pool.shutdown()
+        _extract_pool = None
+
+
+# один объект настроек на процесс вместо пересборки дефолтов на каждый extract
+_TRAFILATURA_CONFIG = trafilatura.settings.use_config()
 
 
 def _extract_text_and_title(html: str, url: str) -> PageDoc | None:
-    text = trafilatura.extract(
+    # один проход lxml вместо двух: текст и метаданные за один extract
+    raw = trafilatura.extract(
         html,
         include_links=False,
         include_images=False,
-        output_format="txt",
+        include_comments=False,
+        output_format="json",
+        with_metadata=True,
+        config=_TRAFILATURA_CONFIG,
     )
+    if not raw:
+        return None
+    data = orjson.loads(raw)
+    text = (data.get("text") or "").strip()
     if not text:
         return None
-    metadata = trafilatura.extract_metadata(html)
-    title = (metadata.title if metadata else None) or url
-    return PageDoc(url=url, title=title.strip(), text=text.strip())
+    title = (data.get("title") or "").strip() or url
+    return PageDoc(url=url, title=title, text=text)
 
 
-def _extract_links(html: str, base_url: str) -> list[str]:
-    parser = LinkExtractor()
-    parser.feed(html)
+def _extract_links(html: str, base_url: str, allowed_netloc: str) -> list[str]:
+    # lxml уже в зависимостях через trafilatura: один C-парс страницы
+    # вместо Python-callback'а HTMLParser на каждый тег
+    try:
+        tree = lxml.html.fromstring(html)
+    except Exception:
+        logger.warning("Failed to parse links: %s", base_url)
+        return []
     links: list[str] = []
-    for href in parser.links:
-        normalized = _normalize_url(base_url, href)
-        if normalized:
-            links.append(normalized)
+    for href in tree.xpath("//a/@href"):
+        normalized = _normalize_url(base_url, str(href))
+        if normalized and normalized[1] == allowed_netloc:
+            links.append(normalized[0])
     return links
 
 
-def crawl_site(root_url: str, max_depth: int = MAX_DEPTH, min_pages: int = MIN_PAGES_PER_DOMAIN) -> list[PageDoc]:
+async def crawl_site(
+    root_url: str, max_depth: int = MAX_DEPTH, min_pages: int = MIN_PAGES_PER_DOMAIN
+) -> list[PageDoc]:
+    # обход по уровням BFS: страницы одного уровня независимы, качаем их
+    # параллельно с ограничением по числу одновременных запросов
     root = root_url.rstrip("/")
-    queue: deque[tuple[str, int]] = deque([(root, 0)])
-    seen: set[str] = set()
+    root_netloc = urlparse(root).netloc.lower()
+    seen: set[str] = {root}
     docs: list[PageDoc] = []
+    level: list[str] = [root]
+    semaphore = asyncio.Semaphore(CRAWL_MAX_CONCURRENCY)
 
-    with httpx.Client(
+    async with httpx.AsyncClient(
         timeout=REQUEST_TIMEOUT,
         follow_redirects=True,
         headers={"User-Agent": "AIforAI-RAG-Indexer/1.0"},
+        limits=httpx.Limits(max_connections=CRAWL_MAX_CONCURRENCY),
     ) as client:
-        while queue and len(docs) < min_pages:
-            url, depth = queue.popleft()
-            if url in seen:
-                continue
-            seen.add(url)
-
-            try:
-                response = client.get(url)
-                response.raise_for_status()
-            except Exception:
-                logger.warning("Failed to fetch page: %s", url)
-                continue
-
-            html = response.text
-            parsed_doc = _extract_text_and_title(html, url)
-            if parsed_doc:
-                docs.append(parsed_doc)
-                logger.info("Indexed page: %s", url)
-
-            if depth >= max_depth:
-                continue
-
-            for link in _extract_links(html, url):
-                if link in seen:
-                    continue
-                if not _same_domain(root, link):
+
+        async def fetch(url: str) -> str | None:
+            async with semaphore:
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                except Exception:
+                    logger.warning("Failed to fetch page: %s", url)
+                    return None
+                return response.text
+
+        loop = asyncio.get_running_loop()
+        pool = _get_extract_pool()
+        for depth in range(max_depth + 1):
+            if not level or len(docs) >= min_pages:
+                break
+            pages = await asyncio.gather(*(fetch(url) for url in level))
+            fetched = [(url, html) for url, html in zip(level, pages) if html is not None]
+            parsed_docs = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _extract_text_and_title, html, url)
+                    for url, html in fetched
+                )
+            )
+            next_level: list[str] = []
+            for (url, html), parsed_doc in zip(fetched, parsed_docs):
+                if parsed_doc:
+                    docs.append(parsed_doc)
+                    logger.info("Indexed page: %s", url)
+                if depth >= max_depth:
                     continue
-                queue.append((link, depth + 1))
+                for link in _extract_links(html, url, root_netloc):
+                    if link in seen:
+                        continue
+                    seen.add(link)
+                    next_level.append(link)
+            level = next_level
 
     return docs
 
@@ -172,7 +213,7 @@ async def _run() -> None:
     try:
         for site in config.kb_sites:
             logger.info("Crawling site: %s", site)
-            pages = await asyncio.to_thread(crawl_site, site)
+            pages = await crawl_site(site)
             total_pages += len(pages)
             records = build_chunk_records(pages)
             inserted = await store.upsert(records)
@@ -185,6 +226,7 @@ async def _run() -> None:
             total_chunks,
         )
     finally:
+        _shutdown_extract_pool()
         await store.close()
 
 
@@ -1,38 +1,40 @@
 from __future__ import annotations
 
-import json
 import logging
 import re
 from typing import Any
 
-from openai import AsyncOpenAI
+import orjson
 
 from app.config import Config
+from app.rag.llm_cache import make_key, response_cache
 from app.rag.prompts import SYSTEM_PROMPT, build_user_prompt
-from app.rag.store import RetrievedChunk
+from app.rag.store import RetrievedChunk, get_openai_client
 
 logger = logging.getLogger(__name__)
 
 MAX_CHUNK_TEXT = 1400
 
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 
 def _extract_json_object(text: str) -> dict[str, Any]:
     text = text.strip()
     try:
-        parsed = json.loads(text)
+        parsed = orjson.loads(text)
         if isinstance(parsed, dict):
             return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
 
-    match = re.search(r"\{.*\}", text, flags=re.DOTALL)
+    match = _JSON_OBJ_RE.search(text)
     if not match:
         return {}
     try:
-        parsed = json.loads(match.group(0))
+        parsed = orjson.loads(match.group(0))
         if isinstance(parsed, dict):
             return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return {}
     return {}
 
@@ -48,7 +50,7 @@ async def _call_json(
     if not config.openai_api_key:
         return default
 
-    client = AsyncOpenAI(api_key=config.openai_api_key)
+    client = get_openai_client(config.openai_api_key)
     try:
         response = await client.responses.create(
             model=config.openai_model,
@@ -70,6 +72,10 @@ async def _call_json(
 
 async def classify_intent(config: Config, message: str) -> dict[str, Any]:
     default = {"intent": "unknown", "confidence": 0.0, "reason": "fallback"}
+    cache_key = make_key("classify_intent", config.openai_model, message)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     result = await _call_json(
         config,
         instructions=(
@@ -86,7 +92,10 @@ async def classify_intent(config: Config, message: str) -> dict[str, Any]:
     confidence = float(result.get("confidence", 0.0) or 0.0)
     confidence = min(1.0, max(0.0, confidence))
     reason = str(result.get("reason", ""))
-    return {"intent": intent, "confidence": confidence, "reason": reason}
+    out = {"intent": intent, "confidence": confidence, "reason": reason}
+    if result is not default:  # fallback'и не кэшируем — дадим LLM второй шанс
+        response_cache.set(cache_key, out)
+    return out
 
 
 async def classify_risk(config: Config, message: str) -> dict[str, Any]:
@@ -97,6 +106,10 @@ async def classify_risk(config: Config, message: str) -> dict[str, Any]:
         "reason": "fallback",
         "confidence": 0.0,
     }
+    cache_key = make_key("classify_risk", config.openai_model, message)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     result = await _call_json(
         config,
         instructions=(
@@ -114,13 +127,16 @@ async def classify_risk(config: Config, message: str) -> dict[str, Any]:
     urgency = str(result.get("urgency", "low")).lower()
     if urgency not in {"low", "medium", "high"}:
         urgency = "low"
-    return {
+    out = {
         "need_human": bool(result.get("need_human", False)),
         "negative": bool(result.get("negative", False)),
         "urgency": urgency,
         "reason": str(result.get("reason", "")),
         "confidence": float(result.get("confidence", 0.0) or 0.0),
     }
+    if result is not default:
+        response_cache.set(cache_key, out)
+    return out
 
 
 async def extract_lead_fields(config: Config, message: str) -> dict[str, str | None]:
@@ -131,6 +147,10 @@ async def extract_lead_fields(config: Config, message: str) -> dict[str, str | N
         "contact_method": None,
         "phone": None,
     }
+    cache_key = make_key("extract_lead_fields", config.openai_model, message)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     result = await _call_json(
         config,
         instructions=(
@@ -145,13 +165,16 @@ async def extract_lead_fields(config: Config, message: str) -> dict[str, str | N
         user_input=message,
         default=default,
     )
-    return {
+    out = {
         "need": _none_or_str(result.get("need")),
         "budget": _none_or_str(result.get("budget")),
         "timeline": _none_or_str(result.get("timeline")),
         "contact_method": _none_or_str(result.get("contact_method")),
         "phone": _none_or_str(result.get("phone")),
     }
+    if result is not default:
+        response_cache.set(cache_key, out)
+    return out
 
 
 def _none_or_str(value: Any) -> str | None:
@@ -185,13 +208,23 @@ async def generate_answer(
         )
 
     lead_ctx = str(lead_context) if lead_context else None
+    # в ключ входят и выбранные чанки: другой retrieved-контекст — другой ответ
+    cache_key = make_key(
+        "generate_answer",
+        config.openai_model,
+        [question, lead_ctx, [(c.source_url, c.text[:MAX_CHUNK_TEXT]) for c in retrieved_chunks]],
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     user_prompt = build_user_prompt(
         question=question,
         context_text="\n\n".join(context_parts),
         lead_context=lead_ctx,
     )
 
-    client = AsyncOpenAI(api_key=config.openai_api_key)
+    client = get_openai_client(config.openai_api_key)
     try:
         response = await client.responses.create(
             model=config.openai_model,
@@ -214,15 +247,9 @@ async def generate_answer(
             "Уточните, пожалуйста, что именно хотите сделать: бот / сайт / автоматизация / другое?"
         )
 
-    source_lines: list[str] = []
-    seen: set[str] = set()
-    for chunk in retrieved_chunks:
-        url = chunk.source_url.strip()
-        if url and url not in seen:
-            seen.add(url)
-            source_lines.append(f"Источник: {url}")
-
-    if source_lines:
-        answer_text = f"{answer_text}\n\n" + "\n".join(source_lines)
+    urls = list(dict.fromkeys(url for chunk in retrieved_chunks if (url := chunk.source_url.strip())))
+    if urls:
+        answer_text = f"{answer_text}\n\n" + "\n".join(f"Источник: {url}" for url in urls)
 
+    response_cache.set(cache_key, answer_text)
     return answer_text
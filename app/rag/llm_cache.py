@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+
+CACHE_MAX_ENTRIES = 2000
+CACHE_TTL_SECONDS = 3600.0
+
+
+class LLMCache:
+    """TTL+LRU кэш ответов LLM в памяти процесса.
+
+    Короткие реплики клиентов повторяются дословно ("бот", "сайт", "да"),
+    и каждый повтор — это 1–3 секунды сетевого round-trip'а к OpenAI.
+    Попадание в кэш превращает его в lookup по dict. Счетчики hits/misses
+    оставлены для наблюдаемости.
+    """
+
+    __slots__ = ("maxsize", "ttl", "hits", "misses", "_entries")
+
+    def __init__(
+        self, maxsize: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def make_key(fn: str, model: str, payload: Any) -> str:
+    # sha256 от канонического JSON: ключ фиксированной длины, безопасен для любых текстов
+    raw = orjson.dumps([fn, model, payload])
+    return hashlib.sha256(raw).hexdigest()
+
+
+# один кэш на процесс: все LLM-вызовы идут через него
+response_cache = LLMCache()
@@ -19,13 +19,16 @@ SYSTEM_PROMPT = """
 
 
 def build_user_prompt(question: str, context_text: str, lead_context: str | None = None) -> str:
+    # стабильная часть (retrieved-контекст) идет первой: серверный prompt
+    # caching OpenAI работает по префиксу, и повторные вопросы по тем же
+    # чанкам переиспользуют закэшированные токены контекста
     lead_block = lead_context or "нет"
     return (
-        "Вопрос клиента:\n"
-        f"{question}\n\n"
         "retrieved-контекст:\n"
         f"{context_text}\n\n"
         "Текущее состояние лида:\n"
         f"{lead_block}\n\n"
+        "Вопрос клиента:\n"
+        f"{question}\n\n"
         "Сформируй ответ по правилам выше."
     )
@@ -1,13 +1,35 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable
 
 import asyncpg
 from openai import AsyncOpenAI
 
 from app.config import Config
+from app.rag.llm_cache import LLMCache, make_key
+
+# эмбеддинги считаем порциями и параллельно: ингест упирается в сеть,
+# а один гигантский запрос упирается в лимиты API
+EMBED_BATCH_SIZE = 96
+EMBED_MAX_CONCURRENCY = 8
+
+# кандидатов HNSW-обхода на запрос (см. sql/migrations/002_kb_chunks_hnsw_index.sql)
+HNSW_EF_SEARCH = 40
+
+# повторный вопрос — это повторный embedding-вызов и ANN-скан; кэшируем
+# результат поиска по тексту запроса на 10 минут
+_search_cache = LLMCache(maxsize=512, ttl=600.0)
+
+
+@lru_cache(maxsize=1)
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    # один клиент на процесс: общий httpx-пул соединений вместо нового
+    # TLS-рукопожатия на каждый LLM/embedding-вызов
+    return AsyncOpenAI(api_key=api_key)
 
 
 @dataclass(slots=True)
@@ -28,7 +50,7 @@ class ChunkRecord:
 class RAGStore:
     def __init__(self, config: Config, *, pool: asyncpg.Pool | None = None) -> None:
         self._config = config
-        self._openai = AsyncOpenAI(api_key=config.openai_api_key) if config.openai_api_key else None
+        self._openai = get_openai_client(config.openai_api_key) if config.openai_api_key else None
         self._external_pool = pool
         self._owned_pool: asyncpg.Pool | None = None
 
@@ -48,32 +70,53 @@ class RAGStore:
         if not self.enabled:
             raise RuntimeError("OPENAI_API_KEY is not configured for embeddings")
 
-        embeddings = await self._embed_texts([r.text for r in records_list])
+        # одинаковые тексты (шапки/подвалы на каждой странице) эмбеддим один раз
+        unique_texts = list(dict.fromkeys(r.text for r in records_list))
+        embeddings = await self._embed_texts(unique_texts)
+        literal_by_text = {
+            text: _vector_literal(embedding)
+            for text, embedding in zip(unique_texts, embeddings)
+        }
         rows = [
             (
                 r.chunk_id,
                 r.source_url,
                 r.title,
                 r.text,
-                _vector_literal(embedding),
+                literal_by_text[r.text],
             )
-            for r, embedding in zip(records_list, embeddings)
+            for r in records_list
         ]
 
+        # COPY в staging-таблицу + один INSERT..SELECT вместо executemany:
+        # строки уходят бинарным протоколом, сервер парсит один statement
         pool = await self._pool()
         async with pool.acquire() as conn:
-            await conn.executemany(
-                """
-                INSERT INTO kb_chunks (id, source_url, title, content, embedding)
-                VALUES ($1, $2, $3, $4, $5::vector)
-                ON CONFLICT (id) DO UPDATE SET
-                    source_url = EXCLUDED.source_url,
-                    title = EXCLUDED.title,
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding
-                """,
-                rows,
-            )
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE kb_chunks_staging (
+                        id text,
+                        source_url text,
+                        title text,
+                        content text,
+                        embedding text
+                    ) ON COMMIT DROP
+                    """
+                )
+                await conn.copy_records_to_table("kb_chunks_staging", records=rows)
+                await conn.execute(
+                    """
+                    INSERT INTO kb_chunks (id, source_url, title, content, embedding)
+                    SELECT id, source_url, title, content, embedding::vector
+                    FROM kb_chunks_staging
+                    ON CONFLICT (id) DO UPDATE SET
+                        source_url = EXCLUDED.source_url,
+                        title = EXCLUDED.title,
+                        content = EXCLUDED.content,
+                        embedding = EXCLUDED.embedding
+                    """
+                )
 
         return len(records_list)
 
@@ -82,6 +125,13 @@ class RAGStore:
         if not query_text or not self.enabled:
             return []
 
+        cache_key = make_key(
+            "rag_search", self._config.openai_embedding_model, [query_text, int(k)]
+        )
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         query_embedding = (await self._embed_texts([query_text]))[0]
         vector = _vector_literal(query_embedding)
         limit = max(1, int(k))
@@ -89,20 +139,24 @@ class RAGStore:
         pool = await self._pool()
         async with pool.acquire() as conn:
             try:
-                rows = await conn.fetch(
-                    """
-                    SELECT content, COALESCE(source_url, '') AS source_url, COALESCE(title, '') AS title
-                    FROM kb_chunks
-                    ORDER BY embedding <=> $1::vector
-                    LIMIT $2
-                    """,
-                    vector,
-                    limit,
-                )
+                async with conn.transaction():
+                    # шире дефолтного ef_search=40 не нужно: k<=6; SET LOCAL
+                    # живет до конца транзакции и не протекает в пул
+                    await conn.execute(f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH}")
+                    rows = await conn.fetch(
+                        """
+                        SELECT content, COALESCE(source_url, '') AS source_url, COALESCE(title, '') AS title
+                        FROM kb_chunks
+                        ORDER BY embedding <=> $1::vector
+                        LIMIT $2
+                        """,
+                        vector,
+                        limit,
+                    )
             except asyncpg.UndefinedTableError:
                 return []
 
-        return [
+        retrieved = [
             RetrievedChunk(
                 text=row["content"],
                 source_url=row["source_url"],
@@ -111,6 +165,8 @@ class RAGStore:
             for row in rows
             if row["content"]
         ]
+        _search_cache.set(cache_key, retrieved)
+        return retrieved
 
     async def _pool(self) -> asyncpg.Pool:
         if self._external_pool is not None:
@@ -125,6 +181,24 @@ class RAGStore:
         return self._owned_pool
 
     async def _embed_texts(self, texts: list[str]) -> list[list[float]]:
+        assert self._openai is not None
+        if len(texts) <= EMBED_BATCH_SIZE:
+            return await self._embed_batch(texts)
+
+        semaphore = asyncio.Semaphore(EMBED_MAX_CONCURRENCY)
+
+        async def bounded(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await self._embed_batch(batch)
+
+        batches = [
+            texts[i : i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)
+        ]
+        # gather сохраняет порядок батчей, API — порядок внутри батча
+        results = await asyncio.gather(*(bounded(batch) for batch in batches))
+        return [embedding for batch in results for embedding in batch]
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
         assert self._openai is not None
         response = await self._openai.embeddings.create(
             model=self._config.openai_embedding_model,
@@ -133,8 +207,17 @@ class RAGStore:
         return [item.embedding for item in response.data]
 
 
+# шаблон printf по размерности кэшируем: форматирование всех 1536 float
+# уходит в один C-вызов оператора % вместо f-string на каждый элемент
+_VECTOR_TEMPLATES: dict[int, str] = {}
+
+
 def _vector_literal(values: list[float]) -> str:
-    return "[" + ",".join(f"{value:.8f}" for value in values) + "]"
+    template = _VECTOR_TEMPLATES.get(len(values))
+    if template is None:
+        template = ",".join(["%.8f"] * len(values))
+        _VECTOR_TEMPLATES[len(values)] = template
+    return "[" + template % tuple(values) + "]"
 
 
 def make_chunk_id(source_url: str, chunk_index: int) -> str:
@@ -16,7 +16,13 @@ from app.handlers import build_admin_router, build_business_router
 logger = logging.getLogger(__name__)
 
 config = load_config()
-db = Database(config.database_url)
+db = Database(
+    config.database_url,
+    min_size=config.db_pool_min,
+    max_size=config.db_pool_max,
+    max_inactive_connection_lifetime=config.db_pool_max_inactive_lifetime,
+    max_queries=config.db_pool_max_queries,
+)
 
 bot = Bot(
     token=config.bot_token,
@@ -32,7 +38,7 @@ app = FastAPI(title="Telegram Business Bot")
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    await db.create_pool()
+    await db.init()
 
     if config.mode == "webhook":
         if not config.webhook_base_url:
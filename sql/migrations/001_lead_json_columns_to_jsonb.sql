@@ -0,0 +1,4 @@
+-- Перевод JSON-колонок лидов на jsonb: asyncpg передает dict/list напрямую
+-- через codec, Postgres хранит разобранное бинарное представление.
+ALTER TABLE leads ALTER COLUMN summary_json TYPE jsonb USING summary_json::jsonb;
+ALTER TABLE leads ALTER COLUMN rag_sources_json TYPE jsonb USING rag_sources_json::jsonb;
@@ -0,0 +1,5 @@
+-- HNSW-индекс по embedding: поиск по kb_chunks перестает быть линейным сканом.
+-- Класс оператора должен совпадать с <=> (косинус) в RAGStore.search.
+CREATE INDEX IF NOT EXISTS kb_chunks_embed_idx
+    ON kb_chunks USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);